@@ -4,11 +4,13 @@ import logging
 import asyncio
 import socket
 import time
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import timedelta
 
 import aiohttp
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
@@ -28,7 +30,22 @@ COMMAND_STALENESS_WINDOW = 3.0
 # back-to-back and the device only processes the first one.
 INTER_COMMAND_DELAY = 0.2
 
-PLATFORMS = ["switch", "fan", "light", "cover"]
+# Window (seconds) during which set-status calls to the same module are merged
+# into a single packet — e.g. a scene or group toggling several channels at once.
+SET_STATUS_BATCH_WINDOW = 0.02
+
+# Maximum number of modules polled concurrently during a sync.
+POLL_CONCURRENCY = 4
+
+# Receive buffer (bytes) for the push listener, so bursts of device
+# broadcasts aren't dropped by the kernel before we read them.
+PUSH_RCVBUF_SIZE = 262144
+
+# How long (seconds) a detected interface/IP/netmask is reused across entry
+# setups and reloads before the network is probed again.
+NETWORK_CACHE_TTL = 300
+
+PLATFORMS = ("switch", "fan", "light", "cover")
 
 
 async def async_setup(hass: HomeAssistant, config: dict):
@@ -56,10 +73,21 @@ async def async_setup(hass: HomeAssistant, config: dict):
 # DataUpdateCoordinator — hybrid polling + push
 # ---------------------------------------------------------------------------
 
+@dataclass(slots=True, frozen=True)
+class SmarteefiChannel:
+    """One configured device channel, parsed once from its "serial:group_id:smap" ID."""
+
+    unique_id: str
+    name: str | None
+    serial: str
+    smap: int
+
+
 class SmarteefiCoordinator(DataUpdateCoordinator):
     """Smarteefi data update coordinator.
 
-    Polls all modules via UDP get-status on an interval (5s initially, then 5s regular).
+    Polls all modules via UDP get-status on an interval (5s initially, then 5s regular),
+    up to POLL_CONCURRENCY modules at a time.
     Push updates from port 8890 are merged in via async_set_updated_data().
     Inter-command delays prevent devices from dropping back-to-back commands.
     """
@@ -75,6 +103,15 @@ class SmarteefiCoordinator(DataUpdateCoordinator):
         self.entry = entry
         self.broadcast_addr = broadcast_addr
         self._is_initial_sync = True
+        self._sync_in_flight = False
+
+        # Shared request/reply UDP endpoint, opened in async_setup_entry.
+        # None means each request opens its own one-shot socket.
+        self.udp_client: udp_protocol.SmarteefiUdpClient | None = None
+
+        # Home Assistant's shared aiohttp session, looked up once and reused
+        # for every ESP32 fallback check and device refresh.
+        self.session = async_get_clientsession(hass)
 
         # ESP32 fallback settings from config entry
         self._fallback_enabled = entry.data.get("fallback_enabled", False)
@@ -85,32 +122,59 @@ class SmarteefiCoordinator(DataUpdateCoordinator):
         # are toggled in quick succession.
         self._serial_locks: dict[str, asyncio.Lock] = {}
 
+        # Bounds concurrent get-status requests across modules; shared by the
+        # scheduled poll and the sync_states service (both refresh through here).
+        self._poll_semaphore = asyncio.Semaphore(POLL_CONCURRENCY)
+
+        # Pending coalesced set-status per serial.
+        # Key: serial, Value: {"switch_map", "status", "future"} still accepting merges.
+        self._pending_set_status: dict[str, dict] = {}
+
         # Track last command time per serial so polling can skip stale updates.
         # Key: serial, Value: monotonic timestamp of last successful command response.
         self._last_command_time: dict[str, float] = {}
 
+        # Track when each serial's state was last reported by the device itself
+        # (poll request sent, or push received), to tell fresh data from data
+        # that predates the last command.
+        # Key: serial, Value: monotonic timestamp.
+        self._last_report_time: dict[str, float] = {}
+
+        # Pre-parse every device once and partition by type, so each platform
+        # reads its own list instead of re-scanning (and re-splitting) all devices.
+        # Key: device type, Value: parsed channels of that type.
+        self.devices_by_type: dict[str, list[SmarteefiChannel]] = {}
+
         # Build module map: serial -> combined switchmap for get-status
-        self._modules: dict[str, int] = {}
+        modules: defaultdict[str, int] = defaultdict(int)
         for device in entry.data.get("devices", []):
-            parts = device["id"].split(":")
-            serial = parts[0]
-            smap = int(parts[2])
-            if serial in self._modules:
-                self._modules[serial] |= smap
-            else:
-                self._modules[serial] = smap
+            # ID format "serial:group_id:smap" — partition instead of split(),
+            # and validate up front rather than failing setup on int()
+            device_id = device["id"]
+            serial, _, rest = device_id.partition(":")
+            _, sep, smap_str = rest.rpartition(":")
+            if not (serial and sep and smap_str.isdigit()):
+                _LOGGER.error("Skipping device with malformed id %r", device_id)
+                continue
+            smap = int(smap_str)
+            self.devices_by_type.setdefault(device["type"], []).append(
+                SmarteefiChannel(device_id, device.get("name"), serial, smap)
+            )
+            modules[serial] |= smap
+        self._modules: dict[str, int] = dict(modules)
 
         # Pre-create locks for known modules
         for serial in self._modules:
             self._serial_locks[serial] = asyncio.Lock()
 
-        _LOGGER.debug(
-            "Coordinator init: broadcast=%s, modules=%s, fallback=%s (ip=%s)",
-            broadcast_addr,
-            {s: f"0x{m:X}" for s, m in self._modules.items()},
-            self._fallback_enabled,
-            self._fallback_ip,
-        )
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Coordinator init: broadcast=%s, modules=%s, fallback=%s (ip=%s)",
+                broadcast_addr,
+                {s: f"0x{m:X}" for s, m in self._modules.items()},
+                self._fallback_enabled,
+                self._fallback_ip,
+            )
 
     def get_serial_lock(self, serial: str) -> asyncio.Lock:
         """Get or create the asyncio Lock for a given module serial."""
@@ -122,6 +186,22 @@ class SmarteefiCoordinator(DataUpdateCoordinator):
         """Record that a command response was just processed for this serial."""
         self._last_command_time[serial] = time.monotonic()
 
+    def mark_report_time(self, serial: str, when: float | None = None) -> None:
+        """Record that the device reported its state (poll or push) at when."""
+        self._last_report_time[serial] = time.monotonic() if when is None else when
+
+    def has_fresh_state(self, serial: str) -> bool:
+        """Return True if the cached state came from a report newer than the last command.
+
+        Command replies are not enough: set-speed/set-intensity replies carry
+        no statusmap, and polls are suppressed right after a command.
+        """
+        reported = self._last_report_time.get(serial)
+        if reported is None:
+            return False
+        commanded = self._last_command_time.get(serial)
+        return commanded is None or reported > commanded
+
     def _is_recently_commanded(self, serial: str) -> bool:
         """Check if a command was processed recently for this serial."""
         last_time = self._last_command_time.get(serial)
@@ -148,92 +228,211 @@ class SmarteefiCoordinator(DataUpdateCoordinator):
                 )
                 await asyncio.sleep(remaining)
 
+    async def async_set_status(self, serial: str, smap: int, turn_on: bool) -> dict | None:
+        """Turn channel(s) on/off, coalescing concurrent calls to the same module.
+
+        Calls for the same serial that arrive within SET_STATUS_BATCH_WINDOW are
+        merged into one set-status packet: switch maps are OR-ed and the status
+        value carries the ON bits. Every caller gets the same response, which is
+        merged into coordinator data once. When the cached state is fresh (see
+        has_fresh_state), channels already in the requested state are masked
+        out under the lock; if none are left, nothing is sent.
+        """
+        batch = self._pending_set_status.get(serial)
+        if batch is not None:
+            batch["switch_map"] |= smap
+            if turn_on:
+                batch["status"] |= smap
+            else:
+                batch["status"] &= ~smap
+            return await asyncio.shield(batch["future"])
+
+        batch = {
+            "switch_map": smap,
+            "status": smap if turn_on else 0,
+            "future": self.hass.loop.create_future(),
+        }
+        self._pending_set_status[serial] = batch
+        resp = None
+        try:
+            await asyncio.sleep(SET_STATUS_BATCH_WINDOW)
+            async with self.get_serial_lock(serial):
+                # Stop accepting merges once this batch is about to be sent
+                self._pending_set_status.pop(serial, None)
+
+                # Only trust the cache when the device reported it after the
+                # last command; otherwise a stale bit could swallow a real change
+                module = (self.data or {}).get(serial)
+                if module and module.get("available") and self.has_fresh_state(serial):
+                    statusmap = module.get("statusmap", 0)
+                    batch["switch_map"] &= batch["status"] ^ statusmap
+                    batch["status"] &= batch["switch_map"]
+                    if not batch["switch_map"]:
+                        _LOGGER.debug("set-status for %s is a no-op, not sending", serial)
+                        resp = {
+                            "result": 1,
+                            "switchmap": module.get("switchmap", 0),
+                            "statusmap": statusmap,
+                        }
+                        return resp
+
+                await self.ensure_command_gap(serial)
+                resp = await udp_protocol.async_set_status_map(
+                    serial, self.broadcast_addr,
+                    batch["switch_map"], batch["status"],
+                    client=self.udp_client,
+                )
+                if resp and resp.get("result") == 1:
+                    self.apply_command_response(serial, resp)
+        finally:
+            if self._pending_set_status.get(serial) is batch:
+                del self._pending_set_status[serial]
+            if not batch["future"].done():
+                batch["future"].set_result(resp)
+        return resp
+
+    def apply_command_response(self, serial: str, resp: dict) -> None:
+        """Merge a UDP command response into coordinator data."""
+        new_data = dict(self.data) if self.data else {}
+        module = dict(new_data.get(serial, {}))
+        module["statusmap"] = resp.get("statusmap", module.get("statusmap", 0))
+        module["switchmap"] = resp.get("switchmap", module.get("switchmap", 0))
+        module["available"] = True
+        new_data[serial] = module
+        # Mark command time so the next poll doesn't overwrite this fresh data
+        self.mark_command_time(serial)
+        self.async_set_updated_data(new_data)
+
     async def _async_update_data(self) -> dict:
         """Poll all modules via UDP get-status with retry + ESP32 fallback."""
 
-        # Switch from initial fast interval to regular interval after first poll
+        # A sync with an offline module (timeout + 5s back-off + retry) can
+        # outlast the interval, and the background first refresh or the
+        # sync_states service can land on top of a scheduled one. Never run
+        # two polls at once — just report the current data.
+        if self._sync_in_flight:
+            _LOGGER.debug("Previous sync still in flight, skipping this one")
+            return self.data or {}
+
+        # Switch from initial fast interval to regular interval after first poll.
+        # The coordinator schedules the next refresh only after this returns,
+        # so changing update_interval here never races the running timer.
         if self._is_initial_sync:
             self._is_initial_sync = False
-            self.update_interval = timedelta(seconds=SYNC_INTERVAL)
-            _LOGGER.debug("Switching to regular sync interval (%ds)", SYNC_INTERVAL)
+            if self.update_interval != timedelta(seconds=SYNC_INTERVAL):
+                self.update_interval = timedelta(seconds=SYNC_INTERVAL)
+                _LOGGER.debug("Switching to regular sync interval (%ds)", SYNC_INTERVAL)
 
         data: dict = dict(self.data) if self.data else {}
 
-        for serial, combined_switchmap in self._modules.items():
-            # Skip polling if a command was just processed for this serial.
-            # The command response already has the freshest state; polling now
-            # risks overwriting it with stale data if the device hasn't fully
-            # settled yet.
-            if self._is_recently_commanded(serial):
+        # Poll modules concurrently, bounded by the semaphore so a large
+        # install doesn't flood the network; one slow/offline module no
+        # longer delays every module behind it.
+        serials = list(self._modules)
+        self._sync_in_flight = True
+        try:
+            results = await asyncio.gather(
+                *(self._async_poll_module(serial) for serial in serials)
+            )
+        finally:
+            self._sync_in_flight = False
+        for serial, module in zip(serials, results):
+            if module is None:
+                # Skipped or kept previous state — leave data[serial] untouched
+                continue
+            data[serial] = {**data.get(serial, {}), **module}
+
+        # If no module answered at all, the cached network may be stale
+        # (interface/IP changed) — force re-detection on the next setup.
+        if data and not any(m.get("available") for m in data.values()):
+            self.hass.data[DOMAIN].pop("network_cache", None)
+
+        return data
+
+    async def _async_poll_module(self, serial: str) -> dict | None:
+        """Poll a single module, returning its new state or None to keep the old one."""
+        # Skip polling if a command was just processed for this serial.
+        # The command response already has the freshest state; polling now
+        # risks overwriting it with stale data if the device hasn't fully
+        # settled yet.
+        if self._is_recently_commanded(serial):
+            if _LOGGER.isEnabledFor(logging.DEBUG):
                 _LOGGER.debug(
                     "Skipping poll for %s — command processed recently (%.1fs ago)",
                     serial,
                     time.monotonic() - self._last_command_time.get(serial, 0),
                 )
-                continue
+            return None
+
+        combined_switchmap = self._modules[serial]
 
+        async with self._poll_semaphore:
             _LOGGER.debug("Polling %s (switchmap=0x%X)", serial, combined_switchmap)
 
             # --- First attempt ---
+            requested_at = time.monotonic()
             resp = await udp_protocol.async_get_status(
-                serial, self.broadcast_addr, combined_switchmap
+                serial, self.broadcast_addr, combined_switchmap,
+                client=self.udp_client,
             )
 
-            if resp is None or resp.get("result") != 1:
-                _LOGGER.warning(
-                    "Device %s offline on first attempt, retrying in 5s...", serial
-                )
-                await asyncio.sleep(5)
+        if resp is None or resp.get("result") != 1:
+            _LOGGER.warning(
+                "Device %s offline on first attempt, retrying in 5s...", serial
+            )
+            # Sleep outside the semaphore so other modules keep polling
+            await asyncio.sleep(5)
 
+            async with self._poll_semaphore:
                 # --- Second attempt ---
+                requested_at = time.monotonic()
                 resp = await udp_protocol.async_get_status(
-                    serial, self.broadcast_addr, combined_switchmap
+                    serial, self.broadcast_addr, combined_switchmap,
+                    client=self.udp_client,
                 )
 
-            if resp is not None and resp.get("result") == 1:
-                # Success
+        if resp is not None and resp.get("result") == 1:
+            # Success
+            self.mark_report_time(serial, requested_at)
+            _LOGGER.debug(
+                "Device %s OK: switchmap=0x%X, statusmap=0x%X",
+                serial,
+                resp.get("switchmap", 0),
+                resp.get("statusmap", 0),
+            )
+            return {
+                "statusmap": resp.get("statusmap", 0),
+                "switchmap": resp.get("switchmap", 0),
+                "available": True,
+            }
+
+        # Both attempts failed — ESP32 fallback check (if enabled)
+        if self._fallback_enabled and self._fallback_ip:
+            esp32_reachable = await self._check_esp32_fallback()
+            if esp32_reachable:
                 _LOGGER.debug(
-                    "Device %s OK: switchmap=0x%X, statusmap=0x%X",
+                    "Device %s UDP offline, but ESP32 (%s) reachable. "
+                    "Keeping previous state.",
                     serial,
-                    resp.get("switchmap", 0),
-                    resp.get("statusmap", 0),
+                    self._fallback_ip,
                 )
-                data[serial] = {
-                    "statusmap": resp.get("statusmap", 0),
-                    "switchmap": resp.get("switchmap", 0),
-                    "available": True,
-                }
-            else:
-                # Both attempts failed — ESP32 fallback check (if enabled)
-                if self._fallback_enabled and self._fallback_ip:
-                    esp32_reachable = await self._check_esp32_fallback()
-                    if esp32_reachable:
-                        _LOGGER.debug(
-                            "Device %s UDP offline, but ESP32 (%s) reachable. "
-                            "Keeping previous state.",
-                            serial,
-                            self._fallback_ip,
-                        )
-                        # Keep whatever was in data[serial] before (don't overwrite)
-                        continue
-
-                _LOGGER.error(
-                    "Device %s offline after retry%s. Marking unavailable.",
-                    serial,
-                    " + ESP32 check" if self._fallback_enabled else "",
-                )
-                data[serial] = {**data.get(serial, {}), "available": False}
+                # Keep whatever was in data[serial] before (don't overwrite)
+                return None
 
-        return data
+        _LOGGER.error(
+            "Device %s offline after retry%s. Marking unavailable.",
+            serial,
+            " + ESP32 check" if self._fallback_enabled else "",
+        )
+        return {"available": False}
 
     async def _check_esp32_fallback(self) -> bool:
         """Check if ESP32 webserver is reachable at the configured fallback IP."""
         if not self._fallback_ip:
             return False
         try:
-            session = async_get_clientsession(self.hass)
             async with asyncio.timeout(5):
-                async with session.get(f"http://{self._fallback_ip}") as response:
+                async with self.session.get(f"http://{self._fallback_ip}") as response:
                     return response.status == 200
         except Exception:
             return False
@@ -262,13 +461,18 @@ class SmarteefiPushProtocol(asyncio.DatagramProtocol):
                 sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
             except (AttributeError, OSError):
                 pass  # Not available on all platforms
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, PUSH_RCVBUF_SIZE)
+            except OSError:
+                pass  # Kernel may cap or refuse the size; keep the default
             _LOGGER.debug("Push listener socket configured on port %d", udp_protocol.PUSH_PORT)
         except Exception as e:
             _LOGGER.error("Error configuring push listener socket: %s", e)
 
     def datagram_received(self, data, addr):
         """Handle incoming push updates from devices."""
-        _LOGGER.debug("Push update from %s (%d bytes): %s", addr, len(data), data.hex())
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Push update from %s (%d bytes): %s", addr, len(data), data.hex())
 
         parsed = None
 
@@ -297,7 +501,7 @@ class SmarteefiPushProtocol(asyncio.DatagramProtocol):
             return
 
         serial = parsed["serial"]
-        _LOGGER.info(
+        _LOGGER.debug(
             "Push update for %s: statusmap=0x%X, switchmap=0x%X",
             serial,
             parsed["statusmap"],
@@ -314,6 +518,7 @@ class SmarteefiPushProtocol(asyncio.DatagramProtocol):
             ),
             "available": True,
         }
+        self.coordinator.mark_report_time(serial)
         self.coordinator.async_set_updated_data(current_data)
 
 
@@ -330,8 +535,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         _LOGGER.error("Access token is missing in config entry")
         return False
 
-    # Auto-detect network interface, IP, and netmask
-    network_interface, ip_address, netmask = _detect_network()
+    # Auto-detect network interface, IP, and netmask (cached across reloads)
+    network_interface, ip_address, netmask = _get_network(hass)
     if not ip_address or not netmask:
         _LOGGER.error("Unable to determine IP address or netmask")
         return False
@@ -341,16 +546,17 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         network_interface, ip_address, netmask,
     )
 
-    # Store network info in config entry for reference
-    hass.config_entries.async_update_entry(
-        entry,
-        data={
-            **entry.data,
-            "network_interface": network_interface,
-            "ip_address": ip_address,
-            "netmask": netmask,
-        },
-    )
+    # Store network info in config entry for reference (only when it changed,
+    # to skip copying the whole entry data — including devices — every setup)
+    network_info = {
+        "network_interface": network_interface,
+        "ip_address": ip_address,
+        "netmask": netmask,
+    }
+    if any(entry.data.get(key) != value for key, value in network_info.items()):
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, **network_info}
+        )
 
     broadcast_addr = udp_protocol.compute_broadcast_addr(ip_address, netmask)
     _LOGGER.info("Broadcast address: %s", broadcast_addr)
@@ -358,8 +564,17 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     # Create the coordinator
     coordinator = SmarteefiCoordinator(hass, entry, broadcast_addr)
 
+    # Open the shared request/reply socket used for polling and commands
+    try:
+        coordinator.udp_client = await udp_protocol.async_create_client()
+        entry.async_on_unload(coordinator.udp_client.close)
+    except OSError as e:
+        _LOGGER.warning(
+            "Failed to open shared UDP socket: %s. Falling back to per-request sockets.",
+            e,
+        )
+
     # Start push listener on port 8890
-    push_transport = None
     try:
         loop = asyncio.get_running_loop()
         push_transport, _ = await loop.create_datagram_endpoint(
@@ -367,6 +582,15 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
             local_addr=("0.0.0.0", udp_protocol.PUSH_PORT),
         )
         _LOGGER.info("Push listener started on port %d", udp_protocol.PUSH_PORT)
+
+        @callback
+        def _stop_push_listener() -> None:
+            push_transport.close()
+            _LOGGER.info("Push listener stopped")
+
+        # Sockets are released by HA's unload callbacks, which also run if
+        # setup fails further down
+        entry.async_on_unload(_stop_push_listener)
     except Exception as e:
         _LOGGER.warning(
             "Failed to start push listener on port %d: %s. "
@@ -375,33 +599,34 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
             e,
         )
 
-    # Do first data refresh (blocks briefly but ensures entities have data)
-    await coordinator.async_refresh()
-
-    # Store coordinator and transport in hass.data
+    # Store coordinator in hass.data
     hass.data[DOMAIN]["coordinator"] = coordinator
-    hass.data[DOMAIN]["push_transport"] = push_transport
 
     # Forward setup to all entity platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Do first data refresh in the background so an offline module (retry +
+    # timeouts) doesn't hold up entry setup; entities show unavailable until
+    # it completes.
+    entry.async_create_background_task(
+        hass, coordinator.async_refresh(), "smarteefi_initial_refresh"
+    )
+
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Unload a config entry."""
-    # Close push listener
-    push_transport = hass.data[DOMAIN].get("push_transport")
-    if push_transport:
-        push_transport.close()
-        _LOGGER.info("Push listener stopped")
+    """Unload a config entry.
 
+    The push listener and shared UDP socket are closed by the callbacks
+    registered with entry.async_on_unload during setup.
+    """
     # Unload all entity platforms
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
         hass.data[DOMAIN].pop("coordinator", None)
-        hass.data[DOMAIN].pop("push_transport", None)
+        hass.data[DOMAIN].pop("login_cache", None)
 
     return unload_ok
 
@@ -410,6 +635,18 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 # Network detection
 # ---------------------------------------------------------------------------
 
+def _get_network(hass: HomeAssistant):
+    """Return (interface, ip, netmask), reusing a recent detection if available."""
+    cached = hass.data[DOMAIN].get("network_cache")
+    if cached is not None and time.monotonic() - cached[0] < NETWORK_CACHE_TTL:
+        return cached[1]
+
+    network = _detect_network()
+    if network[1] and network[2]:
+        hass.data[DOMAIN]["network_cache"] = (time.monotonic(), network)
+    return network
+
+
 def _detect_network():
     """Detect the active network interface, IP address, and netmask."""
     try:
@@ -478,13 +715,19 @@ async def fetch_devices(session: aiohttp.ClientSession, access_token: str):
 
 async def async_refresh_devices(hass: HomeAssistant, entry: ConfigEntry):
     """Refresh devices from Smarteefi v3 API, with re-login if token is stale."""
-    session = async_get_clientsession(hass)
+    # Reuse the coordinator's session; the service can also run while the
+    # entry is not loaded, when there is no coordinator yet
+    coordinator = hass.data[DOMAIN].get("coordinator")
+    session = coordinator.session if coordinator else async_get_clientsession(hass)
     access_token = entry.data.get("access_token")
 
     if not access_token:
         _LOGGER.error("Access token is missing in config entry")
         return False
 
+    # Entry changes collected here and written in a single async_update_entry
+    entry_updates: dict = {}
+
     try:
         _LOGGER.debug("Refreshing devices using access token")
         devices = await fetch_devices(session, access_token)
@@ -498,10 +741,7 @@ async def async_refresh_devices(hass: HomeAssistant, entry: ConfigEntry):
                 new_token = await _api_relogin(session, email, password)
                 if new_token:
                     access_token = new_token
-                    hass.config_entries.async_update_entry(
-                        entry,
-                        data={**entry.data, "access_token": access_token},
-                    )
+                    entry_updates["access_token"] = access_token
                     devices = await fetch_devices(session, access_token)
 
         _LOGGER.debug("Devices refreshed: %s", devices)
@@ -513,31 +753,45 @@ async def async_refresh_devices(hass: HomeAssistant, entry: ConfigEntry):
             if device["id"] in current_type_map:
                 device["type"] = current_type_map[device["id"]]
 
-        # Identify removed devices
+        # Identify added/removed devices
         current_device_ids = {d["id"] for d in current_devices}
         new_device_ids = {d["id"] for d in devices}
-        removed_device_ids = current_device_ids - new_device_ids
+        removed_device_ids = frozenset(current_device_ids - new_device_ids)
+        added_device_ids = frozenset(new_device_ids - current_device_ids)
+
+        # Nothing changed (ids, names, types) — skip the entry write and reload
+        if not added_device_ids and not removed_device_ids and devices == current_devices:
+            _LOGGER.debug("Smarteefi devices unchanged, skipping reload")
+            if entry_updates:
+                hass.config_entries.async_update_entry(
+                    entry, data={**entry.data, **entry_updates}
+                )
+            return True
 
-        # Update config entry with refreshed devices
+        # Update config entry with refreshed devices (and new token, if any)
+        entry_updates["devices"] = devices
         hass.config_entries.async_update_entry(
             entry,
-            data={**entry.data, "devices": devices},
+            data={**entry.data, **entry_updates},
         )
 
         # Remove entities for devices no longer present
         entity_registry = er.async_get(hass)
-        for entity_entry in entity_registry.entities.values():
-            if (
-                entity_entry.config_entry_id == entry.entry_id
-                and entity_entry.unique_id in removed_device_ids
-            ):
-                entity_registry.async_remove(entity_entry.entity_id)
+        entities_to_remove = [
+            entity_entry.entity_id
+            for entity_entry in er.async_entries_for_config_entry(
+                entity_registry, entry.entry_id
+            )
+            if entity_entry.unique_id in removed_device_ids
+        ]
+        for entity_id in entities_to_remove:
+            entity_registry.async_remove(entity_id)
 
         _LOGGER.info("Smarteefi devices refreshed: %s", devices)
 
-        # Reload platforms to reflect changes
-        await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
-        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+        # Reload the entry so the coordinator and platforms pick up the changes
+        await hass.config_entries.async_reload(entry.entry_id)
+        return True
 
     except Exception as e:
         _LOGGER.error("Error refreshing Smarteefi devices: %s", e)
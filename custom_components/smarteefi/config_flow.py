@@ -1,14 +1,135 @@
+import hashlib
 import logging
-import aiohttp
+import os
+import time
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from .const import DOMAIN, API_LOGIN_URL, API_DEVICES_URL
 
 _LOGGER = logging.getLogger(__name__)
 
 DEVICE_TYPES = ["switch", "fan", "light", "cover"]
 
+# Successful logins are reused for this many seconds, so re-submitting the same
+# credentials (e.g. stepping back through the options flow) skips the HTTPS call.
+LOGIN_CACHE_TTL = 300
+
+
+def _login_cache(hass):
+    """Return the login cache stored in hass.data[DOMAIN], creating it if needed.
+
+    {"salt": random bytes, "entries": {salted SHA-256 of email + password:
+    (monotonic timestamp, login response)}}. It lives only as long as the
+    integration's data and is cleared when a flow finishes.
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    cache = domain_data.get("login_cache")
+    if cache is None:
+        cache = domain_data["login_cache"] = {"salt": os.urandom(16), "entries": {}}
+    return cache
+
+
+def _clear_login_cache(hass):
+    """Drop all cached logins (and their access tokens)."""
+    hass.data.get(DOMAIN, {}).pop("login_cache", None)
+
+
+async def _api_login(hass, email, password):
+    """Login to Smarteefi v3 API using Home Assistant's shared session.
+
+    Successful responses are cached for LOGIN_CACHE_TTL seconds; any failure
+    evicts the cached entry for those credentials.
+    """
+    cache = _login_cache(hass)
+    entries = cache["entries"]
+
+    # Drop expired entries so access tokens don't linger
+    now = time.monotonic()
+    expired = [k for k, (ts, _) in entries.items() if now - ts >= LOGIN_CACHE_TTL]
+    for key in expired:
+        del entries[key]
+
+    cache_key = hashlib.sha256(cache["salt"] + f"{email}\0{password}".encode()).hexdigest()
+    cached = entries.get(cache_key)
+    if cached is not None:
+        _LOGGER.debug("Reusing cached Smarteefi login for %s", email)
+        return cached[1]
+
+    result = await _api_login_request(hass, email, password)
+    if result.get("result") == "success":
+        entries[cache_key] = (time.monotonic(), result)
+    else:
+        entries.pop(cache_key, None)
+    return result
+
+
+async def _api_login_request(hass, email, password):
+    """Send the v3 login request."""
+    payload = {
+        "LoginForm": {
+            "email": email,
+            "password": password,
+            "app": "smarteefi",
+        }
+    }
+    headers = {"Content-Type": "application/json"}
+
+    try:
+        session = async_get_clientsession(hass)
+        async with session.post(API_LOGIN_URL, json=payload, headers=headers) as response:
+            if response.status == 200:
+                return await response.json()
+            else:
+                _LOGGER.error("Login API returned status %s", response.status)
+                return {"result": "error", "error_desc": "api_error"}
+    except Exception as e:
+        _LOGGER.error("Exception during login: %s", e)
+        return {"result": "error", "error_desc": str(e)}
+
+
+def _evict_login_token(hass, access_token):
+    """Forget cached logins that handed out access_token."""
+    entries = _login_cache(hass)["entries"]
+    stale = [k for k, (_, res) in entries.items() if res.get("access_token") == access_token]
+    for key in stale:
+        del entries[key]
+
+
+async def _api_fetch_devices(hass, access_token):
+    """Fetch devices from Smarteefi v3 API using Home Assistant's shared session.
+
+    A failed fetch evicts the login that issued access_token, so re-submitting
+    the credentials logs in again instead of replaying a rejected token.
+    """
+    result = await _api_fetch_devices_request(hass, access_token)
+    if result.get("result") != "success":
+        _evict_login_token(hass, access_token)
+    return result
+
+
+async def _api_fetch_devices_request(hass, access_token):
+    """Send the v3 devices request."""
+    payload = {
+        "UserDevice": {
+            "access_token": access_token,
+        }
+    }
+    headers = {"Content-Type": "application/json"}
+
+    try:
+        session = async_get_clientsession(hass)
+        async with session.post(API_DEVICES_URL, json=payload, headers=headers) as response:
+            if response.status == 200:
+                return await response.json()
+            else:
+                _LOGGER.error("Devices API returned status %s", response.status)
+                return {"result": "error", "error_desc": "api_error"}
+    except Exception as e:
+        _LOGGER.error("Exception during device fetch: %s", e)
+        return {"result": "error", "error_desc": str(e)}
+
 
 class SmarteefiConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Smarteefi IoT Platform."""
@@ -28,7 +149,7 @@ class SmarteefiConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             email = user_input["email"]
             password = user_input["password"]
 
-            result = await self._api_login(email, password)
+            result = await _api_login(self.hass, email, password)
 
             if result.get("result") == "success":
                 self._data["email"] = email
@@ -78,7 +199,7 @@ class SmarteefiConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             return await self.async_step_fallback()
 
         # Fetch devices from v3 API
-        result = await self._api_fetch_devices(self._data["access_token"])
+        result = await _api_fetch_devices(self.hass, self._data["access_token"])
 
         if result.get("result") != "success":
             _LOGGER.error("Failed to fetch devices: %s", result)
@@ -131,6 +252,7 @@ class SmarteefiConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             fallback_enabled = user_input.get("fallback_enabled", False)
             fallback_ip = user_input.get("fallback_ip", "").strip()
 
+            _clear_login_cache(self.hass)
             return self.async_create_entry(
                 title=DOMAIN,
                 data={
@@ -154,50 +276,6 @@ class SmarteefiConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             }),
         )
 
-    async def _api_login(self, email, password):
-        """Login to Smarteefi v3 API."""
-        payload = {
-            "LoginForm": {
-                "email": email,
-                "password": password,
-                "app": "smarteefi",
-            }
-        }
-        headers = {"Content-Type": "application/json"}
-
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(API_LOGIN_URL, json=payload, headers=headers) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        _LOGGER.error("Login API returned status %s", response.status)
-                        return {"result": "error", "error_desc": "api_error"}
-        except Exception as e:
-            _LOGGER.error("Exception during login: %s", e)
-            return {"result": "error", "error_desc": str(e)}
-
-    async def _api_fetch_devices(self, access_token):
-        """Fetch devices from Smarteefi v3 API."""
-        payload = {
-            "UserDevice": {
-                "access_token": access_token,
-            }
-        }
-        headers = {"Content-Type": "application/json"}
-
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(API_DEVICES_URL, json=payload, headers=headers) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        _LOGGER.error("Devices API returned status %s", response.status)
-                        return {"result": "error", "error_desc": "api_error"}
-        except Exception as e:
-            _LOGGER.error("Exception during device fetch: %s", e)
-            return {"result": "error", "error_desc": str(e)}
-
     @staticmethod
     @callback
     def async_get_options_flow(config_entry):
@@ -222,7 +300,7 @@ class SmarteefiOptionsFlowHandler(config_entries.OptionsFlow):
             email = user_input["email"]
             password = user_input["password"]
 
-            result = await self._api_login(email, password)
+            result = await _api_login(self.hass, email, password)
 
             if result.get("result") == "success":
                 self._data["email"] = email
@@ -272,7 +350,7 @@ class SmarteefiOptionsFlowHandler(config_entries.OptionsFlow):
             return await self.async_step_fallback()
 
         # Fetch devices from v3 API
-        result = await self._api_fetch_devices(self._data["access_token"])
+        result = await _api_fetch_devices(self.hass, self._data["access_token"])
 
         if result.get("result") != "success":
             _LOGGER.error("Failed to fetch devices during options: %s", result)
@@ -340,6 +418,7 @@ class SmarteefiOptionsFlowHandler(config_entries.OptionsFlow):
                 },
             )
 
+            _clear_login_cache(self.hass)
             return self.async_create_entry(title="", data={})
 
         current_fallback = self.config_entry.data.get("fallback_enabled", False)
@@ -352,47 +431,3 @@ class SmarteefiOptionsFlowHandler(config_entries.OptionsFlow):
                 vol.Optional("fallback_ip", default=current_ip): str,
             }),
         )
-
-    async def _api_login(self, email, password):
-        """Login to Smarteefi v3 API."""
-        payload = {
-            "LoginForm": {
-                "email": email,
-                "password": password,
-                "app": "smarteefi",
-            }
-        }
-        headers = {"Content-Type": "application/json"}
-
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(API_LOGIN_URL, json=payload, headers=headers) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        _LOGGER.error("Login API returned status %s", response.status)
-                        return {"result": "error", "error_desc": "api_error"}
-        except Exception as e:
-            _LOGGER.error("Exception during login: %s", e)
-            return {"result": "error", "error_desc": str(e)}
-
-    async def _api_fetch_devices(self, access_token):
-        """Fetch devices from Smarteefi v3 API."""
-        payload = {
-            "UserDevice": {
-                "access_token": access_token,
-            }
-        }
-        headers = {"Content-Type": "application/json"}
-
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(API_DEVICES_URL, json=payload, headers=headers) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        _LOGGER.error("Devices API returned status %s", response.status)
-                        return {"result": "error", "error_desc": "api_error"}
-        except Exception as e:
-            _LOGGER.error("Exception during device fetch: %s", e)
-            return {"result": "error", "error_desc": str(e)}
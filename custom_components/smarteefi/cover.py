@@ -3,9 +3,10 @@
 import logging
 
 from homeassistant.components.cover import CoverEntity, CoverEntityFeature
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.core import callback
 
 from .const import DOMAIN
+from .entity import SmarteefiEntity
 from . import udp_protocol
 
 _LOGGER = logging.getLogger(__name__)
@@ -14,12 +15,10 @@ _LOGGER = logging.getLogger(__name__)
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up Smarteefi covers from a config entry."""
     coordinator = hass.data[DOMAIN]["coordinator"]
-    devices = entry.data.get("devices", [])
 
     covers = [
-        SmarteefiCover(coordinator, device)
-        for device in devices
-        if device["type"] == "cover"
+        SmarteefiCover(coordinator, channel)
+        for channel in coordinator.devices_by_type.get("cover", [])
     ]
 
     if covers:
@@ -27,30 +26,25 @@ async def async_setup_entry(hass, entry, async_add_entities):
         _LOGGER.debug("Added %d Smarteefi cover entities", len(covers))
 
 
-class SmarteefiCover(CoordinatorEntity, CoverEntity):
+class SmarteefiCover(SmarteefiEntity, CoverEntity):
     """Representation of a Smarteefi cover channel."""
 
-    def __init__(self, coordinator, device):
+    _attr_supported_features = (
+        CoverEntityFeature.OPEN | CoverEntityFeature.CLOSE | CoverEntityFeature.SET_POSITION
+    )
+
+    def __init__(self, coordinator, channel):
         """Initialize the cover."""
         super().__init__(coordinator)
-        self._device = device
-        self._name = device.get("name", "Unnamed Cover")
-        self._unique_id = device["id"]
-
-        # Extract serial and smap from device ID (format: "serial:group_id:smap")
-        parts = self._unique_id.split(":")
-        self._serial = parts[0]
-        self._smap = int(parts[2])
-
-    @property
-    def name(self):
-        """Return the name of the cover."""
-        return self._name
+        self._attr_name = channel.name or "Unnamed Cover"
+        self._attr_unique_id = channel.unique_id
+        self._serial = channel.serial
+        self._smap = channel.smap
 
-    @property
-    def unique_id(self):
-        """Return the unique ID of the cover."""
-        return self._unique_id
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state when this channel changed."""
+        self._async_write_state_if_changed((self.available, self.is_closed))
 
     @property
     def available(self):
@@ -62,11 +56,6 @@ class SmarteefiCover(CoordinatorEntity, CoverEntity):
             return False
         return module.get("available", False)
 
-    @property
-    def supported_features(self):
-        """Return supported features."""
-        return CoverEntityFeature.OPEN | CoverEntityFeature.CLOSE | CoverEntityFeature.SET_POSITION
-
     @property
     def is_closed(self):
         """Return True if the cover is closed."""
@@ -84,83 +73,61 @@ class SmarteefiCover(CoordinatorEntity, CoverEntity):
         return 100
 
     async def async_open_cover(self, **kwargs):
-        """Open the cover via UDP, serialized per module."""
-        lock = self.coordinator.get_serial_lock(self._serial)
-        async with lock:
-            await self.coordinator.ensure_command_gap(self._serial)
-            _LOGGER.info(
-                "Opening cover %s (serial=%s, smap=0x%X)",
-                self._name, self._serial, self._smap,
-            )
-            resp = await udp_protocol.async_set_status(
-                self._serial, self.coordinator.broadcast_addr, self._smap, True
+        """Open the cover via UDP, coalesced with other calls to the module."""
+        _LOGGER.debug(
+            "Opening cover %s (serial=%s, smap=0x%X)",
+            self._attr_name, self._serial, self._smap,
+        )
+        resp = await self.coordinator.async_set_status(self._serial, self._smap, True)
+        if resp and resp.get("result") == 1:
+            _LOGGER.debug(
+                "OPEN response for cover %s: switchmap=0x%X, statusmap=0x%X",
+                self._attr_name, resp.get("switchmap", 0), resp.get("statusmap", 0),
             )
-            if resp and resp.get("result") == 1:
-                _LOGGER.debug(
-                    "OPEN response for cover %s: switchmap=0x%X, statusmap=0x%X",
-                    self._name, resp.get("switchmap", 0), resp.get("statusmap", 0),
-                )
-                self._update_coordinator_from_response(resp)
-            else:
-                _LOGGER.warning("set-status OPEN failed for cover %s (resp=%s)", self._name, resp)
-                await self.coordinator.async_request_refresh()
+        else:
+            _LOGGER.warning("set-status OPEN failed for cover %s (resp=%s)", self._attr_name, resp)
+            await self.coordinator.async_request_refresh()
 
     async def async_close_cover(self, **kwargs):
-        """Close the cover via UDP, serialized per module."""
-        lock = self.coordinator.get_serial_lock(self._serial)
-        async with lock:
-            await self.coordinator.ensure_command_gap(self._serial)
-            _LOGGER.info(
-                "Closing cover %s (serial=%s, smap=0x%X)",
-                self._name, self._serial, self._smap,
+        """Close the cover via UDP, coalesced with other calls to the module."""
+        _LOGGER.debug(
+            "Closing cover %s (serial=%s, smap=0x%X)",
+            self._attr_name, self._serial, self._smap,
+        )
+        resp = await self.coordinator.async_set_status(self._serial, self._smap, False)
+        if resp and resp.get("result") == 1:
+            _LOGGER.debug(
+                "CLOSE response for cover %s: switchmap=0x%X, statusmap=0x%X",
+                self._attr_name, resp.get("switchmap", 0), resp.get("statusmap", 0),
             )
-            resp = await udp_protocol.async_set_status(
-                self._serial, self.coordinator.broadcast_addr, self._smap, False
-            )
-            if resp and resp.get("result") == 1:
-                _LOGGER.debug(
-                    "CLOSE response for cover %s: switchmap=0x%X, statusmap=0x%X",
-                    self._name, resp.get("switchmap", 0), resp.get("statusmap", 0),
-                )
-                self._update_coordinator_from_response(resp)
-            else:
-                _LOGGER.warning("set-status CLOSE failed for cover %s (resp=%s)", self._name, resp)
-                await self.coordinator.async_request_refresh()
+        else:
+            _LOGGER.warning("set-status CLOSE failed for cover %s (resp=%s)", self._attr_name, resp)
+            await self.coordinator.async_request_refresh()
 
     async def async_set_cover_position(self, **kwargs):
-        """Set the cover position, serialized per module."""
+        """Set the cover position via UDP."""
         position = kwargs.get("position", 0)
-        _LOGGER.info("Setting cover %s position to %d", self._name, position)
+        _LOGGER.debug("Setting cover %s position to %d", self._attr_name, position)
 
+        # Fully open/closed go through the set-status batcher, which skips the
+        # packet under the module lock when the cover is already there
         if position == 0:
             await self.async_close_cover()
         elif position == 100:
             await self.async_open_cover()
         else:
-            # Partial position: determine direction based on current state
+            # Partial position: direction depends on the current state, so read
+            # it only after earlier commands to this module have landed
             lock = self.coordinator.get_serial_lock(self._serial)
             async with lock:
                 await self.coordinator.ensure_command_gap(self._serial)
-                current_pos = self.current_cover_position
-                turn_on = position > current_pos
+                turn_on = position > self.current_cover_position
                 resp = await udp_protocol.async_set_status(
-                    self._serial, self.coordinator.broadcast_addr, self._smap, turn_on
+                    self._serial, self.coordinator.broadcast_addr, self._smap, turn_on,
+                    client=self.coordinator.udp_client,
                 )
-
                 if resp and resp.get("result") == 1:
-                    self._update_coordinator_from_response(resp)
+                    self.coordinator.apply_command_response(self._serial, resp)
                 else:
-                    _LOGGER.warning("set-position failed for cover %s (resp=%s)", self._name, resp)
+                    _LOGGER.warning("set-position failed for cover %s (resp=%s)", self._attr_name, resp)
                     await self.coordinator.async_request_refresh()
-
-    def _update_coordinator_from_response(self, resp):
-        """Merge a UDP command response into coordinator data."""
-        new_data = dict(self.coordinator.data) if self.coordinator.data else {}
-        module = dict(new_data.get(self._serial, {}))
-        module["statusmap"] = resp.get("statusmap", module.get("statusmap", 0))
-        module["switchmap"] = resp.get("switchmap", module.get("switchmap", 0))
-        module["available"] = True
-        new_data[self._serial] = module
-        # Mark command time so the next poll doesn't overwrite this fresh data
-        self.coordinator.mark_command_time(self._serial)
-        self.coordinator.async_set_updated_data(new_data)
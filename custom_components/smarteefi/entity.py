@@ -0,0 +1,19 @@
+"""Base entity for Smarteefi channels."""
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+
+class SmarteefiEntity(CoordinatorEntity):
+    """Coordinator entity that skips state writes when its channel is unchanged."""
+
+    # Last state tuple written to HA (see _async_write_state_if_changed)
+    _last_state: tuple | None = None
+
+    @callback
+    def _async_write_state_if_changed(self, state: tuple) -> None:
+        """Write HA state only if state differs from the last one written."""
+        if state == self._last_state:
+            return
+        self._last_state = state
+        self.async_write_ha_state()
@@ -1,30 +1,46 @@
 """Smarteefi fan platform — CoordinatorEntity + pure UDP control."""
 
 import logging
-import math
 
 from homeassistant.components.fan import FanEntity, FanEntityFeature
-from homeassistant.util.percentage import ranged_value_to_percentage, percentage_to_ranged_value
+from homeassistant.core import callback
+from homeassistant.util.percentage import ranged_value_to_percentage
 from homeassistant.util.scaling import int_states_in_range
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
+from .entity import SmarteefiEntity
 from . import udp_protocol
 
 _LOGGER = logging.getLogger(__name__)
 
 SPEED_RANGE = (1, 4)
 
+# Speed (0-4) indexed by statusmap relay bits 4-6 (r1=0x10, r2=0x20, r3=0x40):
+# r3 set -> 4, else r2+r1 -> 3, r2 -> 2, r1 -> 1, none -> 0
+_SPEED_BY_RELAY_BITS = (0, 1, 2, 3, 4, 4, 4, 4)
+
+# Percentage indexed by speed (0-4), precomputed from SPEED_RANGE
+_PCT_BY_SPEED = (0,) + tuple(
+    ranged_value_to_percentage(SPEED_RANGE, speed)
+    for speed in range(SPEED_RANGE[0], SPEED_RANGE[1] + 1)
+)
+
+
+def _percentage_to_speed(percentage: int) -> int:
+    """Convert a percentage to a speed in SPEED_RANGE, 0% -> 0 (off)."""
+    # ceil(percentage * 4 / 100) in integer math
+    if percentage <= 0:
+        return 0
+    return min(SPEED_RANGE[1], (percentage * 4 + 99) // 100)
+
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up Smarteefi fans from a config entry."""
     coordinator = hass.data[DOMAIN]["coordinator"]
-    devices = entry.data.get("devices", [])
 
     fans = [
-        SmarteefiFan(coordinator, device)
-        for device in devices
-        if device["type"] == "fan"
+        SmarteefiFan(coordinator, channel)
+        for channel in coordinator.devices_by_type.get("fan", [])
     ]
 
     if fans:
@@ -32,30 +48,26 @@ async def async_setup_entry(hass, entry, async_add_entities):
         _LOGGER.debug("Added %d Smarteefi fan entities", len(fans))
 
 
-class SmarteefiFan(CoordinatorEntity, FanEntity):
+class SmarteefiFan(SmarteefiEntity, FanEntity):
     """Representation of a Smarteefi fan channel."""
 
-    def __init__(self, coordinator, device):
+    _attr_supported_features = (
+        FanEntityFeature.TURN_ON | FanEntityFeature.TURN_OFF | FanEntityFeature.SET_SPEED
+    )
+    _attr_speed_count = int_states_in_range(SPEED_RANGE)
+
+    def __init__(self, coordinator, channel):
         """Initialize the fan."""
         super().__init__(coordinator)
-        self._device = device
-        self._name = device.get("name", "Unnamed Fan")
-        self._unique_id = device["id"]
-
-        # Extract serial and smap from device ID (format: "serial:group_id:smap")
-        parts = self._unique_id.split(":")
-        self._serial = parts[0]
-        self._smap = int(parts[2])
+        self._attr_name = channel.name or "Unnamed Fan"
+        self._attr_unique_id = channel.unique_id
+        self._serial = channel.serial
+        self._smap = channel.smap
 
-    @property
-    def name(self):
-        """Return the name of the fan."""
-        return self._name
-
-    @property
-    def unique_id(self):
-        """Return the unique ID of the fan."""
-        return self._unique_id
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state when this channel changed."""
+        self._async_write_state_if_changed((self.available, self.is_on, self.percentage))
 
     @property
     def available(self):
@@ -67,11 +79,6 @@ class SmarteefiFan(CoordinatorEntity, FanEntity):
             return False
         return module.get("available", False)
 
-    @property
-    def supported_features(self):
-        """Return supported features."""
-        return FanEntityFeature.TURN_ON | FanEntityFeature.TURN_OFF | FanEntityFeature.SET_SPEED
-
     @property
     def is_on(self) -> bool | None:
         """Return True if the fan channel is on."""
@@ -84,15 +91,7 @@ class SmarteefiFan(CoordinatorEntity, FanEntity):
     @property
     def percentage(self) -> int | None:
         """Return the current speed percentage."""
-        speed = self._extract_speed()
-        if speed == 0:
-            return 0
-        return ranged_value_to_percentage(SPEED_RANGE, speed)
-
-    @property
-    def speed_count(self) -> int:
-        """Return the number of speeds the fan supports."""
-        return int_states_in_range(SPEED_RANGE)
+        return _PCT_BY_SPEED[self._extract_speed()]
 
     def _extract_speed(self) -> int:
         """Extract fan speed (0-4) from statusmap bits 4-6."""
@@ -100,100 +99,102 @@ class SmarteefiFan(CoordinatorEntity, FanEntity):
             return 0
         module = self.coordinator.data.get(self._serial, {})
         statusmap = module.get("statusmap", 0)
+        return _SPEED_BY_RELAY_BITS[(statusmap >> 4) & 0x7]
 
-        if statusmap == 0:
-            return 0
+    async def async_turn_on(self, percentage: int | None = None, preset_mode: str | None = None, **kwargs) -> None:
+        """Turn the fan on via UDP, optionally at a given speed."""
+        if percentage == 0:
+            # Turning on at 0% means off — skip the ON packet entirely
+            await self.async_turn_off()
+            return
 
-        r1 = statusmap & 0x10
-        r2 = statusmap & 0x20
-        r3 = statusmap & 0x40
-
-        if r3:
-            return 4
-        elif r2 and r1:
-            return 3
-        elif r2:
-            return 2
-        elif r1:
-            return 1
-        return 0
+        _LOGGER.debug(
+            "Turning ON fan %s (serial=%s, smap=0x%X)",
+            self._attr_name, self._serial, self._smap,
+        )
 
-    async def async_turn_on(self, percentage: int | None = None, preset_mode: str | None = None, **kwargs) -> None:
-        """Turn the fan on via UDP, serialized per module."""
-        lock = self.coordinator.get_serial_lock(self._serial)
-        async with lock:
-            await self.coordinator.ensure_command_gap(self._serial)
-            _LOGGER.info(
-                "Turning ON fan %s (serial=%s, smap=0x%X)",
-                self._name, self._serial, self._smap,
-            )
-            resp = await udp_protocol.async_set_status(
-                self._serial, self.coordinator.broadcast_addr, self._smap, True
-            )
+        if percentage is None:
+            resp = await self.coordinator.async_set_status(self._serial, self._smap, True)
             if resp and resp.get("result") == 1:
                 _LOGGER.debug(
                     "ON response for fan %s: switchmap=0x%X, statusmap=0x%X",
-                    self._name, resp.get("switchmap", 0), resp.get("statusmap", 0),
+                    self._attr_name, resp.get("switchmap", 0), resp.get("statusmap", 0),
                 )
-                self._update_coordinator_from_response(resp)
             else:
-                _LOGGER.warning("set-status ON failed for fan %s (resp=%s)", self._name, resp)
+                _LOGGER.warning("set-status ON failed for fan %s (resp=%s)", self._attr_name, resp)
                 await self.coordinator.async_request_refresh()
+            return
 
-        if percentage is not None:
-            await self.async_set_percentage(percentage)
-
-    async def async_turn_off(self, **kwargs) -> None:
-        """Turn the fan off via UDP, serialized per module."""
+        # ON + speed back-to-back under one lock; one response is merged into
+        # coordinator data, so HA sees a single state write. The ON packet is
+        # skipped only when a fresh device report already shows the fan on.
+        speed = _percentage_to_speed(percentage)
         lock = self.coordinator.get_serial_lock(self._serial)
         async with lock:
             await self.coordinator.ensure_command_gap(self._serial)
-            _LOGGER.info(
-                "Turning OFF fan %s (serial=%s, smap=0x%X)",
-                self._name, self._serial, self._smap,
-            )
-            resp = await udp_protocol.async_set_status(
-                self._serial, self.coordinator.broadcast_addr, self._smap, False
-            )
-            if resp and resp.get("result") == 1:
-                _LOGGER.debug(
-                    "OFF response for fan %s: switchmap=0x%X, statusmap=0x%X",
-                    self._name, resp.get("switchmap", 0), resp.get("statusmap", 0),
+            resp = None
+            if not (self.coordinator.has_fresh_state(self._serial) and self.is_on):
+                resp = await udp_protocol.async_set_status(
+                    self._serial, self.coordinator.broadcast_addr, self._smap, True,
+                    client=self.coordinator.udp_client,
                 )
-                self._update_coordinator_from_response(resp)
+                if not resp or resp.get("result") != 1:
+                    _LOGGER.warning("set-status ON failed for fan %s (resp=%s)", self._attr_name, resp)
+                    await self.coordinator.async_request_refresh()
+                    return
+                self.coordinator.mark_command_time(self._serial)
+                await self.coordinator.ensure_command_gap(self._serial)
+
+            speed_resp = await udp_protocol.async_set_speed(
+                self._serial, self.coordinator.broadcast_addr, self._smap, speed,
+                client=self.coordinator.udp_client,
+            )
+            if speed_resp and speed_resp.get("result") == 1:
+                # Prefer the ON reply: set-speed replies carry no statusmap
+                resp = resp or speed_resp
             else:
-                _LOGGER.warning("set-status OFF failed for fan %s (resp=%s)", self._name, resp)
-                await self.coordinator.async_request_refresh()
+                _LOGGER.warning("set-speed failed for fan %s (resp=%s)", self._attr_name, speed_resp)
+                if resp is None:
+                    await self.coordinator.async_request_refresh()
+                    return
+            self.coordinator.apply_command_response(self._serial, resp)
+
+    async def async_turn_off(self, **kwargs) -> None:
+        """Turn the fan off via UDP, coalesced with other calls to the module."""
+        _LOGGER.debug(
+            "Turning OFF fan %s (serial=%s, smap=0x%X)",
+            self._attr_name, self._serial, self._smap,
+        )
+        resp = await self.coordinator.async_set_status(self._serial, self._smap, False)
+        if resp and resp.get("result") == 1:
+            _LOGGER.debug(
+                "OFF response for fan %s: switchmap=0x%X, statusmap=0x%X",
+                self._attr_name, resp.get("switchmap", 0), resp.get("statusmap", 0),
+            )
+        else:
+            _LOGGER.warning("set-status OFF failed for fan %s (resp=%s)", self._attr_name, resp)
+            await self.coordinator.async_request_refresh()
 
     async def async_set_percentage(self, percentage: int) -> None:
         """Set the fan speed via UDP, serialized per module."""
-        speed = math.ceil(percentage_to_ranged_value(SPEED_RANGE, percentage))
-        _LOGGER.info("Setting fan %s speed to %d (percentage=%d)", self._name, speed, percentage)
-
-        if speed:
-            lock = self.coordinator.get_serial_lock(self._serial)
-            async with lock:
-                await self.coordinator.ensure_command_gap(self._serial)
-                resp = await udp_protocol.async_set_speed(
-                    self._serial, self.coordinator.broadcast_addr, self._smap, speed
-                )
-                if resp and resp.get("result") == 1:
-                    self._update_coordinator_from_response(resp)
-                else:
-                    _LOGGER.warning("set-speed failed for fan %s (resp=%s)", self._name, resp)
-                    await self.coordinator.async_request_refresh()
-        else:
+        speed = _percentage_to_speed(percentage)
+        if not speed:
             # Speed 0 = turn off
             await self.async_turn_off()
+            return
 
-    def _update_coordinator_from_response(self, resp):
-        """Merge a UDP command response into coordinator data."""
-        new_data = dict(self.coordinator.data) if self.coordinator.data else {}
-        module = dict(new_data.get(self._serial, {}))
-        module["statusmap"] = resp.get("statusmap", module.get("statusmap", 0))
-        module["switchmap"] = resp.get("switchmap", module.get("switchmap", 0))
-        module["available"] = True
-        new_data[self._serial] = module
-        # Mark command time so the next poll doesn't overwrite this fresh data
-        self.coordinator.mark_command_time(self._serial)
-        self.coordinator.async_set_updated_data(new_data)
+        _LOGGER.debug("Setting fan %s speed to %d (percentage=%d)", self._attr_name, speed, percentage)
+        lock = self.coordinator.get_serial_lock(self._serial)
+        async with lock:
+            await self.coordinator.ensure_command_gap(self._serial)
+            # Always sent: set-speed replies carry no statusmap, so the cached
+            # speed bits can't tell whether this speed is already set
+            resp = await udp_protocol.async_set_speed(
+                self._serial, self.coordinator.broadcast_addr, self._smap, speed,
+                client=self.coordinator.udp_client,
+            )
+            if resp and resp.get("result") == 1:
+                self.coordinator.apply_command_response(self._serial, resp)
+            else:
+                _LOGGER.warning("set-speed failed for fan %s (resp=%s)", self._attr_name, resp)
+                await self.coordinator.async_request_refresh()
@@ -1,25 +1,29 @@
 """Smarteefi light platform — CoordinatorEntity + pure UDP control."""
 
+import asyncio
 import logging
 
 from homeassistant.components.light import LightEntity, ColorMode, ATTR_BRIGHTNESS, ATTR_RGB_COLOR
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.core import callback
 
 from .const import DOMAIN
+from .entity import SmarteefiEntity
 from . import udp_protocol
 
 _LOGGER = logging.getLogger(__name__)
 
+# Brightness/color slider drags fire many turn_on calls in quick succession;
+# only the latest values within this window are sent to the device
+TURN_ON_DEBOUNCE_DELAY = 0.08
+
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up Smarteefi lights from a config entry."""
     coordinator = hass.data[DOMAIN]["coordinator"]
-    devices = entry.data.get("devices", [])
 
     lights = [
-        SmarteefiLight(coordinator, device)
-        for device in devices
-        if device["type"] == "light"
+        SmarteefiLight(coordinator, channel)
+        for channel in coordinator.devices_by_type.get("light", [])
     ]
 
     if lights:
@@ -27,34 +31,44 @@ async def async_setup_entry(hass, entry, async_add_entities):
         _LOGGER.debug("Added %d Smarteefi light entities", len(lights))
 
 
-class SmarteefiLight(CoordinatorEntity, LightEntity):
+class SmarteefiLight(SmarteefiEntity, LightEntity):
     """Representation of a Smarteefi light channel."""
 
-    def __init__(self, coordinator, device):
+    def __init__(self, coordinator, channel):
         """Initialize the light."""
         super().__init__(coordinator)
-        self._device = device
-        self._name = device.get("name", "Unnamed Light")
-        self._unique_id = device["id"]
-
-        # Extract serial and smap from device ID (format: "serial:group_id:smap")
-        parts = self._unique_id.split(":")
-        self._serial = parts[0]
-        self._smap = int(parts[2])
+        self._attr_name = channel.name or "Unnamed Light"
+        self._attr_unique_id = channel.unique_id
+        self._serial = channel.serial
+        self._smap = channel.smap
 
         # Local state for brightness/color (not always derivable from statusmap alone)
         self._brightness = 255
         self._rgb_color = (255, 255, 255)
 
-    @property
-    def name(self):
-        """Return the name of the light."""
-        return self._name
-
-    @property
-    def unique_id(self):
-        """Return the unique ID of the light."""
-        return self._unique_id
+        # Debounced turn_on: pending flush task and the merged kwargs it will send
+        self._pending_task: asyncio.Task | None = None
+        self._pending_kwargs: dict = {}
+
+    async def async_added_to_hass(self) -> None:
+        """Register cleanup of a pending debounced turn_on."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._cancel_pending_turn_on)
+
+    @callback
+    def _cancel_pending_turn_on(self) -> None:
+        """Drop a debounced turn_on that has not been sent yet."""
+        if self._pending_task is not None:
+            self._pending_task.cancel()
+            self._pending_task = None
+        self._pending_kwargs = {}
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state when this channel changed."""
+        self._async_write_state_if_changed(
+            (self.available, self.is_on, self.brightness, self.rgb_color)
+        )
 
     @property
     def available(self):
@@ -88,19 +102,12 @@ class SmarteefiLight(CoordinatorEntity, LightEntity):
     @property
     def brightness(self):
         """Return the brightness of the light."""
-        if not self.coordinator.data:
+        rgb = self._extract_rgb()
+        if rgb is None:
             return 0
-        module = self.coordinator.data.get(self._serial, {})
-        statusmap = module.get("statusmap", 0)
 
-        if statusmap == 0:
-            return 0
-
-        # Extract RGB from statusmap and derive brightness
-        r = (statusmap & 0xFF000000) >> 24
-        g = (statusmap & 0x00FF0000) >> 16
-        b = (statusmap & 0x0000FF00) >> 8
-        brightness = max(r, g, b)
+        # Derive brightness from the brightest channel
+        brightness = max(rgb)
         if brightness > 0:
             self._brightness = brightness
         return self._brightness
@@ -108,111 +115,143 @@ class SmarteefiLight(CoordinatorEntity, LightEntity):
     @property
     def rgb_color(self):
         """Return the RGB color of the light."""
-        if not self.coordinator.data:
+        rgb = self._extract_rgb()
+        if rgb is None:
             return (0, 0, 0)
+
+        if any(rgb):
+            self._rgb_color = rgb
+        return self._rgb_color
+
+    def _extract_rgb(self) -> tuple[int, int, int] | None:
+        """Extract (r, g, b) from statusmap bytes 3-1, or None if there is no status."""
+        if not self.coordinator.data:
+            return None
         module = self.coordinator.data.get(self._serial, {})
         statusmap = module.get("statusmap", 0)
 
         if statusmap == 0:
-            return (0, 0, 0)
+            return None
 
-        r = (statusmap & 0xFF000000) >> 24
-        g = (statusmap & 0x00FF0000) >> 16
-        b = (statusmap & 0x0000FF00) >> 8
-        if r or g or b:
-            self._rgb_color = (r, g, b)
-        return self._rgb_color
+        r, g, b, _ = statusmap.to_bytes(4, "big")
+        return (r, g, b)
 
     async def async_turn_on(self, **kwargs):
+        """Turn the light on, coalescing rapid calls within TURN_ON_DEBOUNCE_DELAY.
+
+        Later brightness/color values override earlier ones; every caller
+        waits for the single flush that carries its values.
+        """
+        self._pending_kwargs = {**self._pending_kwargs, **kwargs}
+        if self._pending_task is None:
+            self._pending_task = self.hass.async_create_task(self._async_flush_turn_on())
+        task = self._pending_task
+        try:
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # A turn_off superseded this turn_on; only re-raise our own cancellation
+            if not task.cancelled():
+                raise
+
+    async def _async_flush_turn_on(self) -> None:
+        """Send the latest debounced turn_on once the window has passed."""
+        await asyncio.sleep(TURN_ON_DEBOUNCE_DELAY)
+        kwargs = self._pending_kwargs
+        self._pending_kwargs = {}
+        self._pending_task = None
+        await self._async_send_turn_on(kwargs)
+
+    async def _async_send_turn_on(self, kwargs: dict) -> None:
         """Turn the light on with optional brightness and color control, serialized per module."""
         lock = self.coordinator.get_serial_lock(self._serial)
         async with lock:
             await self.coordinator.ensure_command_gap(self._serial)
-            _LOGGER.info(
+            _LOGGER.debug(
                 "Turning ON light %s (serial=%s, smap=0x%X)",
-                self._name, self._serial, self._smap,
+                self._attr_name, self._serial, self._smap,
             )
 
             brightness = kwargs.get(ATTR_BRIGHTNESS, self._brightness)
             rgb_color = kwargs.get(ATTR_RGB_COLOR, self._rgb_color)
             r, g, b = rgb_color
 
-            if r or g or b:
+            if not (r or g or b):
+                # RGB is (0,0,0) — turn off instead, unless already off
+                if self.available and not self.is_on:
+                    return
+                resp = await udp_protocol.async_set_status(
+                    self._serial, self.coordinator.broadcast_addr, self._smap, False,
+                    client=self.coordinator.udp_client,
+                )
+                if resp and resp.get("result") == 1:
+                    self.coordinator.apply_command_response(self._serial, resp)
+                else:
+                    await self.coordinator.async_request_refresh()
+                return
+
+            # Snapshot current state so an unchanged color (scene/restore re-sends) is skipped
+            was_on = self.is_on
+            current_rgb = self.rgb_color
+            # Last successful response; merged into coordinator data once at the end
+            final_resp = None
+
+            if not (was_on and tuple(rgb_color) == current_rgb):
                 # Set RGB color
                 resp = await udp_protocol.async_set_rgb_color(
-                    self._serial, self.coordinator.broadcast_addr, self._smap, r, g, b
+                    self._serial, self.coordinator.broadcast_addr, self._smap, r, g, b,
+                    client=self.coordinator.udp_client,
                 )
                 if resp and resp.get("result") == 1:
                     _LOGGER.debug(
                         "RGB response for light %s: switchmap=0x%X, statusmap=0x%X",
-                        self._name, resp.get("switchmap", 0), resp.get("statusmap", 0),
+                        self._attr_name, resp.get("switchmap", 0), resp.get("statusmap", 0),
                     )
                     self._rgb_color = rgb_color
-                    self._update_coordinator_from_response(resp)
+                    final_resp = resp
                 else:
-                    _LOGGER.warning("set-rgb-color failed for light %s (resp=%s)", self._name, resp)
+                    _LOGGER.warning("set-rgb-color failed for light %s (resp=%s)", self._attr_name, resp)
                     await self.coordinator.async_request_refresh()
-            else:
-                # RGB is (0,0,0) — turn off instead
-                resp = await udp_protocol.async_set_status(
-                    self._serial, self.coordinator.broadcast_addr, self._smap, False
-                )
-                if resp and resp.get("result") == 1:
-                    self._update_coordinator_from_response(resp)
-                else:
-                    await self.coordinator.async_request_refresh()
-                return
 
             # Set intensity (brightness 0-255 -> 0-100)
             intensity = self._brightness_to_intensity(brightness)
+            # Always sent: set-intensity replies carry no statusmap, so the cached
+            # brightness can't tell whether this intensity is already set
             if intensity:
                 resp = await udp_protocol.async_set_intensity(
-                    self._serial, self.coordinator.broadcast_addr, self._smap, intensity
+                    self._serial, self.coordinator.broadcast_addr, self._smap, intensity,
+                    client=self.coordinator.udp_client,
                 )
                 if resp and resp.get("result") == 1:
                     self._brightness = brightness
-                    self._update_coordinator_from_response(resp)
+                    # Keep a set-rgb-color reply if there is one: set-intensity
+                    # replies carry no statusmap
+                    final_resp = final_resp or resp
                 else:
-                    _LOGGER.warning("set-intensity failed for light %s (resp=%s)", self._name, resp)
+                    _LOGGER.warning("set-intensity failed for light %s (resp=%s)", self._attr_name, resp)
                     await self.coordinator.async_request_refresh()
 
+            if final_resp is not None:
+                self.coordinator.apply_command_response(self._serial, final_resp)
+
     async def async_turn_off(self, **kwargs):
-        """Turn the light off via UDP, serialized per module."""
-        lock = self.coordinator.get_serial_lock(self._serial)
-        async with lock:
-            await self.coordinator.ensure_command_gap(self._serial)
-            _LOGGER.info(
-                "Turning OFF light %s (serial=%s, smap=0x%X)",
-                self._name, self._serial, self._smap,
+        """Turn the light off via UDP, coalesced with other calls to the module."""
+        self._cancel_pending_turn_on()
+        _LOGGER.debug(
+            "Turning OFF light %s (serial=%s, smap=0x%X)",
+            self._attr_name, self._serial, self._smap,
+        )
+        resp = await self.coordinator.async_set_status(self._serial, self._smap, False)
+        if resp and resp.get("result") == 1:
+            _LOGGER.debug(
+                "OFF response for light %s: switchmap=0x%X, statusmap=0x%X",
+                self._attr_name, resp.get("switchmap", 0), resp.get("statusmap", 0),
             )
-            resp = await udp_protocol.async_set_status(
-                self._serial, self.coordinator.broadcast_addr, self._smap, False
-            )
-            if resp and resp.get("result") == 1:
-                _LOGGER.debug(
-                    "OFF response for light %s: switchmap=0x%X, statusmap=0x%X",
-                    self._name, resp.get("switchmap", 0), resp.get("statusmap", 0),
-                )
-                self._update_coordinator_from_response(resp)
-            else:
-                _LOGGER.warning("set-status OFF failed for light %s (resp=%s)", self._name, resp)
-                await self.coordinator.async_request_refresh()
-
-    def _update_coordinator_from_response(self, resp):
-        """Merge a UDP command response into coordinator data."""
-        new_data = dict(self.coordinator.data) if self.coordinator.data else {}
-        module = dict(new_data.get(self._serial, {}))
-        module["statusmap"] = resp.get("statusmap", module.get("statusmap", 0))
-        module["switchmap"] = resp.get("switchmap", module.get("switchmap", 0))
-        module["available"] = True
-        new_data[self._serial] = module
-        # Mark command time so the next poll doesn't overwrite this fresh data
-        self.coordinator.mark_command_time(self._serial)
-        self.coordinator.async_set_updated_data(new_data)
+        else:
+            _LOGGER.warning("set-status OFF failed for light %s (resp=%s)", self._attr_name, resp)
+            await self.coordinator.async_request_refresh()
 
     @staticmethod
     def _brightness_to_intensity(brightness: int) -> int:
         """Convert HA brightness (0-255) to Smarteefi intensity (0-100)."""
-        if not 0 <= brightness <= 255:
-            brightness = max(0, min(255, brightness))
-        return round((brightness / 255) * 100)
+        # Rounded brightness * 100 / 255 in integer math; HA already clamps to 0-255
+        return (brightness * 100 + 127) // 255
@@ -3,10 +3,10 @@
 import logging
 
 from homeassistant.components.switch import SwitchEntity
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.core import callback
 
 from .const import DOMAIN
-from . import udp_protocol
+from .entity import SmarteefiEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -14,12 +14,10 @@ _LOGGER = logging.getLogger(__name__)
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up Smarteefi switches from a config entry."""
     coordinator = hass.data[DOMAIN]["coordinator"]
-    devices = entry.data.get("devices", [])
 
     switches = [
-        SmarteefiSwitch(coordinator, device)
-        for device in devices
-        if device["type"] == "switch"
+        SmarteefiSwitch(coordinator, channel)
+        for channel in coordinator.devices_by_type.get("switch", [])
     ]
 
     if switches:
@@ -27,30 +25,21 @@ async def async_setup_entry(hass, entry, async_add_entities):
         _LOGGER.debug("Added %d Smarteefi switch entities", len(switches))
 
 
-class SmarteefiSwitch(CoordinatorEntity, SwitchEntity):
+class SmarteefiSwitch(SmarteefiEntity, SwitchEntity):
     """Representation of a Smarteefi switch channel."""
 
-    def __init__(self, coordinator, device):
+    def __init__(self, coordinator, channel):
         """Initialize the switch."""
         super().__init__(coordinator)
-        self._device = device
-        self._name = device.get("name", "Unnamed Switch")
-        self._unique_id = device["id"]
+        self._attr_name = channel.name or "Unnamed Switch"
+        self._attr_unique_id = channel.unique_id
+        self._serial = channel.serial
+        self._smap = channel.smap
 
-        # Extract serial and smap from device ID (format: "serial:group_id:smap")
-        parts = self._unique_id.split(":")
-        self._serial = parts[0]
-        self._smap = int(parts[2])
-
-    @property
-    def name(self):
-        """Return the name of the switch."""
-        return self._name
-
-    @property
-    def unique_id(self):
-        """Return the unique ID of the switch."""
-        return self._unique_id
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state when this channel changed."""
+        self._async_write_state_if_changed((self.available, self.is_on))
 
     @property
     def available(self):
@@ -72,67 +61,43 @@ class SmarteefiSwitch(CoordinatorEntity, SwitchEntity):
         return (statusmap & self._smap) != 0
 
     async def async_turn_on(self, **kwargs):
-        """Turn the switch on via UDP, serialized per module."""
-        lock = self.coordinator.get_serial_lock(self._serial)
-        async with lock:
-            await self.coordinator.ensure_command_gap(self._serial)
-            _LOGGER.info(
-                "Turning ON switch %s (serial=%s, smap=0x%X)",
-                self._name, self._serial, self._smap,
+        """Turn the switch on via UDP, coalesced with other calls to the module."""
+        _LOGGER.debug(
+            "Turning ON switch %s (serial=%s, smap=0x%X)",
+            self._attr_name, self._serial, self._smap,
+        )
+        resp = await self.coordinator.async_set_status(self._serial, self._smap, True)
+        if resp and resp.get("result") == 1:
+            _LOGGER.debug(
+                "ON response for %s: switchmap=0x%X, statusmap=0x%X",
+                self._attr_name,
+                resp.get("switchmap", 0),
+                resp.get("statusmap", 0),
             )
-            resp = await udp_protocol.async_set_status(
-                self._serial, self.coordinator.broadcast_addr, self._smap, True
+        else:
+            _LOGGER.warning(
+                "set-status ON failed for %s (resp=%s), scheduling refresh",
+                self._attr_name, resp,
             )
-            if resp and resp.get("result") == 1:
-                _LOGGER.debug(
-                    "ON response for %s: switchmap=0x%X, statusmap=0x%X",
-                    self._name,
-                    resp.get("switchmap", 0),
-                    resp.get("statusmap", 0),
-                )
-                self._update_coordinator_from_response(resp)
-            else:
-                _LOGGER.warning(
-                    "set-status ON failed for %s (resp=%s), scheduling refresh",
-                    self._name, resp,
-                )
-                await self.coordinator.async_request_refresh()
+            await self.coordinator.async_request_refresh()
 
     async def async_turn_off(self, **kwargs):
-        """Turn the switch off via UDP, serialized per module."""
-        lock = self.coordinator.get_serial_lock(self._serial)
-        async with lock:
-            await self.coordinator.ensure_command_gap(self._serial)
-            _LOGGER.info(
-                "Turning OFF switch %s (serial=%s, smap=0x%X)",
-                self._name, self._serial, self._smap,
+        """Turn the switch off via UDP, coalesced with other calls to the module."""
+        _LOGGER.debug(
+            "Turning OFF switch %s (serial=%s, smap=0x%X)",
+            self._attr_name, self._serial, self._smap,
+        )
+        resp = await self.coordinator.async_set_status(self._serial, self._smap, False)
+        if resp and resp.get("result") == 1:
+            _LOGGER.debug(
+                "OFF response for %s: switchmap=0x%X, statusmap=0x%X",
+                self._attr_name,
+                resp.get("switchmap", 0),
+                resp.get("statusmap", 0),
             )
-            resp = await udp_protocol.async_set_status(
-                self._serial, self.coordinator.broadcast_addr, self._smap, False
+        else:
+            _LOGGER.warning(
+                "set-status OFF failed for %s (resp=%s), scheduling refresh",
+                self._attr_name, resp,
             )
-            if resp and resp.get("result") == 1:
-                _LOGGER.debug(
-                    "OFF response for %s: switchmap=0x%X, statusmap=0x%X",
-                    self._name,
-                    resp.get("switchmap", 0),
-                    resp.get("statusmap", 0),
-                )
-                self._update_coordinator_from_response(resp)
-            else:
-                _LOGGER.warning(
-                    "set-status OFF failed for %s (resp=%s), scheduling refresh",
-                    self._name, resp,
-                )
-                await self.coordinator.async_request_refresh()
-
-    def _update_coordinator_from_response(self, resp):
-        """Merge a UDP command response into coordinator data."""
-        new_data = dict(self.coordinator.data) if self.coordinator.data else {}
-        module = dict(new_data.get(self._serial, {}))
-        module["statusmap"] = resp.get("statusmap", module.get("statusmap", 0))
-        module["switchmap"] = resp.get("switchmap", module.get("switchmap", 0))
-        module["available"] = True
-        new_data[self._serial] = module
-        # Mark command time so the next poll doesn't overwrite this fresh data
-        self.coordinator.mark_command_time(self._serial)
-        self.coordinator.async_set_updated_data(new_data)
+            await self.coordinator.async_request_refresh()
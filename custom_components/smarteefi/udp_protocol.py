@@ -17,6 +17,7 @@ Response format (66 bytes for get/set-digital):
 """
 
 import asyncio
+import functools
 import logging
 import random
 import socket
@@ -49,6 +50,13 @@ PKT_SIZE_80 = 80   # set-speed, set-intensity
 # Default timeout for UDP send/receive
 DEFAULT_TIMEOUT = 3.0
 
+# Precompiled wire formats (unpacked in C, one call per field group)
+_PUSH_STRUCT = struct.Struct("<16sBIBI")   # serial, ':', switchmap, ':', status
+_PAIR_STRUCT = struct.Struct("<II")        # result/error and switchMap/statusMap
+
+# Header offsets 8-23: protocol flags, always 16 bytes of 0x01
+_HEADER_FLAGS = b"\x01" * 16
+
 
 # ---------------------------------------------------------------------------
 # Packet builders
@@ -69,13 +77,19 @@ def _build_header(buf: bytearray, pkt_type: int, payload_size: int, serial: str)
     struct.pack_into("<H", buf, 2, payload_size)
     struct.pack_into(">I", buf, 4, random.randint(0, 0xFFFFFFFF))
 
-    # Protocol flags: 16 bytes of 0x01
-    for i in range(8, 24):
-        buf[i] = 0x01
+    # Protocol flags + serial: invariant per device, copied in one slice
+    buf[8:40] = _header_tail(serial)
+
+
+@functools.lru_cache(maxsize=128)
+def _header_tail(serial: str) -> bytes:
+    """
+    Return the invariant header bytes 8-39 for a serial (cached per serial).
 
-    # Serial (up to 15 ASCII chars + null terminator, zero-padded to 16)
-    serial_bytes = serial.encode("ascii")[:15]
-    buf[24:24 + len(serial_bytes)] = serial_bytes
+    16 bytes of 0x01 protocol flags, then the serial (up to 15 ASCII chars +
+    null terminator, zero-padded to 16).
+    """
+    return _HEADER_FLAGS + serial.encode("ascii")[:15].ljust(16, b"\x00")
 
 
 def build_get_status(serial: str, switch_map: int = 0xFFFFFFFF) -> bytes:
@@ -173,11 +187,11 @@ def parse_response(data: bytes) -> Optional[dict]:
 
     serial = data[26:42].split(b"\x00")[0].decode("ascii", errors="replace").strip()
 
-    result = struct.unpack_from("<I", data, 50)[0]
-    error = struct.unpack_from("<I", data, 54)[0]
+    result, error = _PAIR_STRUCT.unpack_from(data, 50)
 
     parsed = {
         "response_type": resp_type,
+        "txn": txn,
         "serial": serial,
         "result": result,
         "error": error,
@@ -185,8 +199,7 @@ def parse_response(data: bytes) -> Optional[dict]:
 
     # Get/Set digital responses have switchMap + statusMap
     if resp_type in (RESP_GET_DIGITAL, RESP_SET_DIGITAL) and len(data) >= 66:
-        parsed["switchmap"] = struct.unpack_from("<I", data, 58)[0]
-        parsed["statusmap"] = struct.unpack_from("<I", data, 62)[0]
+        parsed["switchmap"], parsed["statusmap"] = _PAIR_STRUCT.unpack_from(data, 58)
 
     # Set analog response
     elif resp_type == RESP_SET_ANALOG and len(data) >= 62:
@@ -208,19 +221,17 @@ def parse_push_update(data: bytes) -> Optional[dict]:
       Offset 21:    ':' separator (0x3A)
       Offset 22-25: status (4 bytes little-endian uint32)
     """
-    if len(data) < 26:
+    if len(data) < _PUSH_STRUCT.size:
         return None
 
-    if data[16] != 0x3A or data[21] != 0x3A:
+    serial_raw, sep1, switchmap, sep2, status = _PUSH_STRUCT.unpack_from(data)
+    if sep1 != 0x3A or sep2 != 0x3A:
         return None
 
-    serial = data[0:16].split(b"\x00")[0].decode("ascii", errors="replace").strip()
+    serial = serial_raw.split(b"\x00")[0].decode("ascii", errors="replace").strip()
     if not serial:
         return None
 
-    switchmap = struct.unpack_from("<I", data, 17)[0]
-    status = struct.unpack_from("<I", data, 22)[0]
-
     return {
         "serial": serial,
         "switchmap": switchmap,
@@ -232,16 +243,112 @@ def parse_push_update(data: bytes) -> Optional[dict]:
 # Async UDP send/receive
 # ---------------------------------------------------------------------------
 
+class SmarteefiUdpClient(asyncio.DatagramProtocol):
+    """
+    Persistent UDP endpoint for request/reply traffic to devices.
+
+    One socket is opened per config entry and reused for every request instead
+    of creating and closing an endpoint per packet. Replies are matched to the
+    waiting request by the txn the device echoes back, so a late reply to a
+    timed-out request is dropped instead of answering the next one.
+    """
+
+    def __init__(self):
+        """Initialize the client."""
+        self.transport = None
+        self._pending: dict[int, asyncio.Future] = {}
+
+    def connection_made(self, transport):
+        """Enable broadcast on the shared socket."""
+        self.transport = transport
+        sock = transport.get_extra_info("socket")
+        if sock:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+
+    def datagram_received(self, data, addr):
+        """Resolve the pending request whose txn this reply echoes."""
+        resp = parse_response(data)
+        if resp is None:
+            _LOGGER.debug("Ignoring short UDP datagram from %s (%d bytes)", addr, len(data))
+            return
+
+        future = self._pending.pop(resp["txn"], None)
+        if future is not None and not future.done():
+            _LOGGER.debug("UDP response from %s (%d bytes)", addr, len(data))
+            future.set_result(resp)
+            return
+
+        _LOGGER.debug(
+            "Unsolicited or late UDP response from %s: serial=%s, type=0x%X, txn=0x%08X",
+            addr, resp["serial"], resp["response_type"], resp["txn"],
+        )
+
+    def error_received(self, exc):
+        """Log socket errors; pending requests fall through to their timeout."""
+        _LOGGER.error("UDP error: %s", exc)
+
+    def connection_lost(self, exc):
+        """Drop the transport so callers fall back to one-shot endpoints."""
+        self.transport = None
+
+    async def async_request(
+        self,
+        packet: bytes,
+        broadcast_addr: str,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> Optional[dict]:
+        """Send a packet on the shared socket and wait for the matching reply."""
+        serial = packet[24:40].split(b"\x00")[0].decode("ascii", errors="replace").strip()
+        txn = struct.unpack_from(">I", packet, 4)[0]
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[txn] = future
+        try:
+            self.transport.sendto(packet, (broadcast_addr, CONTROL_PORT))
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            _LOGGER.debug("UDP request for %s timed out after %.1fs", serial, timeout)
+            return None
+        except Exception as e:
+            _LOGGER.error("UDP request error: %s", e)
+            return None
+        finally:
+            if self._pending.get(txn) is future:
+                del self._pending[txn]
+
+    def close(self) -> None:
+        """Close the shared socket."""
+        if self.transport:
+            self.transport.close()
+            self.transport = None
+
+
+async def async_create_client() -> SmarteefiUdpClient:
+    """Open the shared request/reply UDP endpoint on an ephemeral port."""
+    loop = asyncio.get_running_loop()
+    _, client = await loop.create_datagram_endpoint(
+        SmarteefiUdpClient,
+        local_addr=("0.0.0.0", 0),
+        family=socket.AF_INET,
+    )
+    return client
+
+
 async def async_send_and_receive(
     packet: bytes,
     broadcast_addr: str,
     timeout: float = DEFAULT_TIMEOUT,
+    client: Optional[SmarteefiUdpClient] = None,
 ) -> Optional[dict]:
     """
     Send a UDP packet to broadcast_addr:CONTROL_PORT and wait for a response.
 
-    Uses asyncio for non-blocking I/O. Returns parsed response dict or None.
+    Goes through the shared client when one is given and connected; otherwise
+    opens a one-shot endpoint for this packet. Returns parsed response dict or None.
     """
+    if client is not None and client.transport is not None:
+        return await client.async_request(packet, broadcast_addr, timeout)
+
     loop = asyncio.get_running_loop()
     future = loop.create_future()
     transport = None
@@ -299,13 +406,14 @@ async def async_get_status(
     broadcast_addr: str,
     switch_map: int = 0xFFFFFFFF,
     timeout: float = DEFAULT_TIMEOUT,
+    client: Optional[SmarteefiUdpClient] = None,
 ) -> Optional[dict]:
     """
     Send get-status and return parsed response.
     Returns dict with 'switchmap' and 'statusmap' keys on success, or None.
     """
     packet = build_get_status(serial, switch_map)
-    return await async_send_and_receive(packet, broadcast_addr, timeout)
+    return await async_send_and_receive(packet, broadcast_addr, timeout, client)
 
 
 async def async_set_status(
@@ -314,6 +422,7 @@ async def async_set_status(
     switch_map: int,
     turn_on: bool,
     timeout: float = DEFAULT_TIMEOUT,
+    client: Optional[SmarteefiUdpClient] = None,
 ) -> Optional[dict]:
     """
     Send set-status to turn a channel ON or OFF.
@@ -324,12 +433,33 @@ async def async_set_status(
     Returns parsed response dict on success, or None.
     """
     status_value = switch_map if turn_on else 0
+    return await async_set_status_map(
+        serial, broadcast_addr, switch_map, status_value, timeout, client
+    )
+
+
+async def async_set_status_map(
+    serial: str,
+    broadcast_addr: str,
+    switch_map: int,
+    status_value: int,
+    timeout: float = DEFAULT_TIMEOUT,
+    client: Optional[SmarteefiUdpClient] = None,
+) -> Optional[dict]:
+    """
+    Send set-status with an explicit status bitmask.
+
+    Lets one packet turn some channels ON and others OFF: every channel in
+    switch_map is set to its bit in status_value. Other channels are untouched.
+
+    Returns parsed response dict on success, or None.
+    """
     _LOGGER.debug(
-        "async_set_status: serial=%s, switch_map=0x%X, status_value=0x%X, turn_on=%s",
-        serial, switch_map, status_value, turn_on,
+        "async_set_status: serial=%s, switch_map=0x%X, status_value=0x%X",
+        serial, switch_map, status_value,
     )
     packet = build_set_status(serial, switch_map, status_value)
-    resp = await async_send_and_receive(packet, broadcast_addr, timeout)
+    resp = await async_send_and_receive(packet, broadcast_addr, timeout, client)
     if resp:
         _LOGGER.debug(
             "async_set_status response: serial=%s, result=%s, switchmap=0x%X, statusmap=0x%X",
@@ -349,13 +479,14 @@ async def async_set_speed(
     switch_map: int,
     speed: int,
     timeout: float = DEFAULT_TIMEOUT,
+    client: Optional[SmarteefiUdpClient] = None,
 ) -> Optional[dict]:
     """
     Send set-speed for fan control.
     Returns parsed response dict on success, or None.
     """
     packet = build_set_speed(serial, switch_map, speed)
-    return await async_send_and_receive(packet, broadcast_addr, timeout)
+    return await async_send_and_receive(packet, broadcast_addr, timeout, client)
 
 
 async def async_set_intensity(
@@ -364,13 +495,14 @@ async def async_set_intensity(
     switch_map: int,
     intensity: int,
     timeout: float = DEFAULT_TIMEOUT,
+    client: Optional[SmarteefiUdpClient] = None,
 ) -> Optional[dict]:
     """
     Send set-intensity for light brightness.
     Returns parsed response dict on success, or None.
     """
     packet = build_set_intensity(serial, switch_map, intensity)
-    return await async_send_and_receive(packet, broadcast_addr, timeout)
+    return await async_send_and_receive(packet, broadcast_addr, timeout, client)
 
 
 async def async_set_rgb_color(
@@ -379,13 +511,14 @@ async def async_set_rgb_color(
     switch_map: int,
     r: int, g: int, b: int,
     timeout: float = DEFAULT_TIMEOUT,
+    client: Optional[SmarteefiUdpClient] = None,
 ) -> Optional[dict]:
     """
     Send set-rgb-color for light color control.
     Returns parsed response dict on success, or None.
     """
     packet = build_set_rgb_color(serial, switch_map, r, g, b)
-    return await async_send_and_receive(packet, broadcast_addr, timeout)
+    return await async_send_and_receive(packet, broadcast_addr, timeout, client)
 
 
 def compute_broadcast_addr(ip_address: str, netmask: str) -> str: